@@ -2,9 +2,10 @@ import argparse
 import sys
 import os
 from dotenv import load_dotenv
-from typing import Dict, Set
+from typing import Dict
 from src.api.client import APIClient
-from src.core.tables.table import Table
+from src.api.cache import TableCache
+from src.core.tables.dependency_resolver import DependencyResolver
 from src.core.tables.excel_writer import ExcelWriter
 from src.api.models import ApiTable, ApiCell, CellType, CellReference
 
@@ -16,82 +17,66 @@ def main():
     parser.add_argument("--list", action="store_true", help="List all available tables.")
     parser.add_argument("--output", default="output.xlsx", help="Output Excel file name.")
     parser.add_argument("--test", action="store_true", help="Run in test mode with mock data.")
+    parser.add_argument("--cache", help="File to cache fetched tables in between runs.")
+    parser.add_argument("--cache-ttl", type=float, default=3600,
+                        help="Seconds a cached table is used without asking the server.")
 
     args = parser.parse_args()
 
-    token = os.getenv("BUILDIN_AI_TOKEN")
-    if not token and not args.test:
-        print("Error: BUILDIN_AI_TOKEN environment variable not set.")
-        sys.exit(1)
-
-        token = "dummy_token"
-
-    client = APIClient(token=token)
-
     if args.test:
-        print("Running in TEST mode with mock data.")
-        mock_data = generate_mock_data()
-        client.set_mock_mode(mock_data)
-
-    if args.list:
-        print("Fetching list of tables...")
-        tables = client.get_tables()
-        if tables:
-            print(f"Found {len(tables)} tables:")
-            for t in tables:
-                if isinstance(t, dict):
-                     t_id = t.get("id", "N/A")
-                     t_name = t.get("name", "N/A")
-                     print(f"- {t_name} (ID: {t_id})")
-                else:
-                    print(f"- {t}")
-        else:
-            print("No tables found or failed to fetch list.")
-        return
-
-    if not args.table_id:
-        print("Error: --table-id is required unless --list is used.")
-        parser.print_help()
-        sys.exit(1)
-
-    if args.test and args.table_id not in mock_data:
-         print(f"Mock data does not contain {args.table_id}, but continuing (might fail). Available: {list(mock_data.keys())}")
-
-    print(f"Fetching table {args.table_id} and dependencies...")
-
-    tables_to_process = [args.table_id]
-    processed_table_ids: Set[str] = set()
-    fetched_tables: Dict[str, Table] = {}
-
-    while tables_to_process:
-        current_id = tables_to_process.pop(0)
-        if current_id in processed_table_ids:
-            continue
-
-        print(f"Fetching {current_id}...")
-        api_table = client.get_table(current_id)
-
-        if not api_table:
-            print(f"Failed to fetch table {current_id}. Skipping.")
-            continue
-
-        table = Table(api_table)
-        fetched_tables[current_id] = table
-        processed_table_ids.add(current_id)
-
-        linked_ids = table.get_linked_table_ids()
-        for link_id in linked_ids:
-            if link_id not in processed_table_ids and link_id not in tables_to_process:
-                tables_to_process.append(link_id)
-
-    if not fetched_tables:
-        print("No tables fetched. Exiting.")
-        return
-
-    print(f"Fetched {len(fetched_tables)} tables. Writing to {args.output}...")
-    writer = ExcelWriter(args.output)
-    writer.write_tables(list(fetched_tables.values()))
-    print("Done.")
+        #mock mode never talks to the server
+        token = "dummy_token"
+    else:
+        token = os.getenv("BUILDIN_AI_TOKEN")
+        if not token:
+            print("Error: BUILDIN_AI_TOKEN environment variable not set.")
+            sys.exit(1)
+
+    cache = TableCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+
+    with APIClient(token=token, cache=cache) as client:
+        if args.test:
+            print("Running in TEST mode with mock data.")
+            mock_data = generate_mock_data()
+            client.set_mock_mode(mock_data)
+
+        if args.list:
+            print("Fetching list of tables...")
+            tables = client.get_tables()
+            if tables:
+                print(f"Found {len(tables)} tables:")
+                for t in tables:
+                    if isinstance(t, dict):
+                         t_id = t.get("id", "N/A")
+                         t_name = t.get("name", "N/A")
+                         print(f"- {t_name} (ID: {t_id})")
+                    else:
+                        print(f"- {t}")
+            else:
+                print("No tables found or failed to fetch list.")
+            return
+
+        if not args.table_id:
+            print("Error: --table-id is required unless --list is used.")
+            parser.print_help()
+            sys.exit(1)
+
+        if args.test and args.table_id not in mock_data:
+             print(f"Mock data does not contain {args.table_id}, but continuing (might fail). Available: {list(mock_data.keys())}")
+
+        print(f"Fetching table {args.table_id} and dependencies...")
+
+        resolver = DependencyResolver(client)
+        fetched_tables = resolver.resolve(args.table_id)
+
+        if not fetched_tables:
+            print("No tables fetched. Exiting.")
+            return
+
+        print(f"Fetched {len(fetched_tables)} tables. Writing to {args.output}...")
+        writer = ExcelWriter(args.output)
+        writer.write_tables(resolver.ordered_tables())
+        print("Done.")
 
 def generate_mock_data() -> Dict[str, ApiTable]:
     t1 = ApiTable(
@@ -0,0 +1,70 @@
+import shelve
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple
+from src.api.models import ApiTable
+
+_ENTRY_KEYS = ("stored_at", "etag", "last_modified", "body")
+
+class TableCache:
+    def __init__(self, path: str, ttl: float = 3600):
+        self.path = path
+        self.ttl = ttl
+        #shelve is not thread safe and tables are fetched from a thread pool
+        self._lock = threading.Lock()
+        self._db = shelve.open(path)
+
+    def get(self, table_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._db.get(table_id)
+
+    def lookup(self, table_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[ApiTable]]:
+        try:
+            entry = self.get(table_id)
+            if entry is None:
+                return None, None
+            if not isinstance(entry, dict) or any(key not in entry for key in _ENTRY_KEYS):
+                raise ValueError(f"entry is missing one of {_ENTRY_KEYS}")
+            return entry, self.load(entry)
+        except Exception as e:
+            #written by an older version, got truncated or isn't even a valid pickle, act like it was never there
+            print(f"Dropping broken cache entry for {table_id}: {e}")
+            self.delete(table_id)
+            return None, None
+
+    def delete(self, table_id: str):
+        #del and not pop, pop would try to unpickle the broken value again
+        with self._lock:
+            try:
+                del self._db[table_id]
+            except KeyError:
+                pass
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def store(self, table_id: str, table: ApiTable, etag: Optional[str] = None,
+              last_modified: Optional[str] = None):
+        with self._lock:
+            self._db[table_id] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body": table.model_dump_json(),
+                "stored_at": time.time()
+            }
+
+    def touch(self, table_id: str):
+        #server said 304 so the body is still good, just restart the ttl
+        with self._lock:
+            entry = self._db.get(table_id)
+            if entry:
+                entry["stored_at"] = time.time()
+                self._db[table_id] = entry
+
+    @staticmethod
+    def load(entry: Dict[str, Any]) -> ApiTable:
+        return ApiTable.model_validate_json(entry["body"])
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,20 +1,44 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, List, Dict
-from src.api.models import ApiTable, ApiResponse, ApiCell, CellType
-from datetime import datetime
-import json
+from src.api.models import ApiTable
+from src.api.cache import TableCache
 
 class APIClient:
-    def __init__(self, token: str, base_url: str = "https://api.buildin.ai"):
+    def __init__(self, token: str, base_url: str = "https://api.buildin.ai",
+                 cache: Optional[TableCache] = None, max_workers: int = 16):
         self.token = token
         self.base_url = base_url.rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        #one pool per host, keep-alive so every table fetch doesn't redo TCP+TLS handshake
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._cache = cache
+        self.max_workers = max_workers
+        self._batch_supported = True
         self._mock_data = {}
         self._is_mock = False
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._session.close()
+        if self._cache:
+            self._cache.close()
+
     def set_mock_mode(self, mock_data: Dict[str, ApiTable]):
         self._is_mock = True
         self._mock_data = mock_data
@@ -26,7 +50,7 @@ class APIClient:
         #GET /tables
         url = f"{self.base_url}/tables"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._session.get(url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 if "tables" in data:
@@ -46,13 +70,29 @@ class APIClient:
         if self._is_mock:
             return self._mock_data.get(table_id)
 
+        entry, cached_table = self._cache.lookup(table_id) if self._cache else (None, None)
+        if entry and self._cache.is_fresh(entry):
+            return cached_table
+
         #GET /tables/{table_id}
         url = f"{self.base_url}/tables/{table_id}"
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                return ApiTable(**data)
+            response = self._session.get(url, headers=headers, timeout=10)
+            if response.status_code == 304 and entry:
+                self._cache.touch(table_id)
+                return cached_table
+            elif response.status_code == 200:
+                #pydantic parses the raw bytes itself, no intermediate dict
+                table = ApiTable.model_validate_json(response.content)
+                if self._cache:
+                    self._cache.store(table_id, table, response.headers.get("ETag"),
+                                      response.headers.get("Last-Modified"))
+                return table
             elif response.status_code == 404:
                 print(f"Table {table_id} not found.")
                 return None
@@ -60,4 +100,39 @@ class APIClient:
                 response.raise_for_status()
         except Exception as e:
             print(f"Error fetching table {table_id}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def get_tables_batch(self, table_ids: List[str]) -> Dict[str, Optional[ApiTable]]:
+        if self._is_mock:
+            return {table_id: self._mock_data.get(table_id) for table_id in table_ids}
+
+        #batch can't do per table If-None-Match, so with a cache every table goes through get_table
+        if self._batch_supported and not self._cache and len(table_ids) > 1:
+            tables = self._post_batch(table_ids)
+            if tables is not None:
+                return tables
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(zip(table_ids, pool.map(self.get_table, table_ids)))
+
+    def _post_batch(self, table_ids: List[str]) -> Optional[Dict[str, Optional[ApiTable]]]:
+        #POST /tables:batch
+        #the endpoint is a guess, so any failure means this server can't do it and we stop asking
+        url = f"{self.base_url}/tables:batch"
+        try:
+            response = self._session.post(url, json={"ids": table_ids}, timeout=10)
+            if response.status_code != 200:
+                self._batch_supported = False
+                print(f"Batch endpoint returned {response.status_code}, fetching tables one by one.")
+                return None
+
+            data = response.json()
+            tables = data.get("tables", data) if isinstance(data, dict) else None
+            if not isinstance(tables, dict):
+                raise ValueError("expected an object of tables keyed by id")
+            return {table_id: ApiTable.model_validate(tables[table_id]) if tables.get(table_id) else None
+                    for table_id in table_ids}
+        except Exception as e:
+            self._batch_supported = False
+            print(f"Error fetching tables batch, fetching tables one by one: {e}")
+            return None
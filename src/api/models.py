@@ -1,7 +1,17 @@
 from enum import Enum
-from typing import *
+from functools import lru_cache
+from typing import Optional, Any, Dict, List, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
+
+#only a handful of different columns show up in one table, so remember each letter after the first time
+@lru_cache(maxsize=None)
+def _compute_column_letter(col: int) -> str:
+    result = ""
+    while col>0:
+        col, remainder = divmod(col -1,  26)
+        result = chr(65 + remainder) + result 
+    return result
 
 class CellType(str, Enum):
     VALUE = "value"
@@ -30,19 +40,13 @@ class ApiCell(BaseModel):
     id: str
     row: int #потом подумаю как сделать лимиты как в экселе, для строк от 1 до 1048576
     column: int # для столбцов максимум 16384
-    value: Optional[Any] = None
+    value: Any = None
     cell_type: CellType
-    formula: Optional[Any] = None
+    formula: Any = None
     format_type: Optional[FormatType] = None
     reference: List[CellReference] = Field(default_factory=list)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
-    @field_validator('reference')
-    def validate_references(cls, v, info):
-        if info.data.get('cell_type') == CellType.LINK and not v:
-            pass
-        return v
-    
     @property
     def excel_address(self) -> str:
         column_letter = self._column_to_letter(self.column)
@@ -50,11 +54,7 @@ class ApiCell(BaseModel):
     
     @staticmethod
     def _column_to_letter(col: int) -> str:
-        result = ""
-        while col>0:
-            col, remainder = divmod(col -1,  26)
-            result = chr(65 + remainder) + result 
-        return result
+        return _compute_column_letter(col)
     
 class ApiTable(BaseModel):
     id: str
@@ -2,15 +2,15 @@ from abc import ABC, abstractmethod
 from src.api.models import ApiCell
 
 class BaseCell(ABC):
+    #tables can have a LOT of cells so no per-cell __dict__
+    __slots__ = ('row', 'column', 'api_cell', 'coordinate')
+
     def __init__(self, api_cell: ApiCell):
         self.row = api_cell.row
         self.column = api_cell.column
         self.api_cell = api_cell
+        self.coordinate: str = api_cell.excel_address
 
     @abstractmethod
     def get_value(self):
-        pass
-
-    @property
-    def coordinate(self) -> str:
-        return self.api_cell.excel_address
\ No newline at end of file
+        pass
\ No newline at end of file
@@ -2,6 +2,8 @@ from src.core.cells.base_cell import BaseCell
 from src.api.models import ApiCell
 
 class FormulaCell(BaseCell):
+    __slots__ = ('formula',)
+
     def __init__(self, api_cell: ApiCell):
         super().__init__(api_cell)
         self.formula = api_cell.formula
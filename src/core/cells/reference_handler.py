@@ -3,19 +3,23 @@ from src.core.cells.base_cell import BaseCell
 from src.api.models import ApiCell
 
 class ReferenceHandler(BaseCell):
+    __slots__ = ('references', 'ref_table_id', 'ref_address')
+
     def __init__(self, api_cell: ApiCell):
         super().__init__(api_cell)
         self.references = api_cell.reference
+        #taking the first reference for simplicity idgaf
+        #kept apart so the writer doesn't have to split the LINK: string back up for every cell
+        self.ref_table_id = self.references[0].table_id if self.references else None
+        self.ref_address = self.references[0].cell_address if self.references else None
 
     def get_value(self):
         #uhhh ???? gonna think abt dis later
         if not self.references:
             return "Reference Error"
 
-        #taking the first reference for simplicity idgaf
-        ref = self.references[0]
         #gon need to resolve table_id to sheet name later idk
-        return f"LINK:{ref.table_id}!{ref.cell_address}"
+        return f"LINK:{self.ref_table_id}!{self.ref_address}"
 
     def get_referenced_table_ids(self) -> List[str]:
-        return [ref.table_id for ref in self.references]
\ No newline at end of file
+        return [ref.table_id for ref in self.references]
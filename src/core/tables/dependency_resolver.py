@@ -0,0 +1,71 @@
+from collections import deque
+from typing import List, Dict, Set
+from src.api.client import APIClient
+from src.core.tables.table import Table
+
+class DependencyResolver:
+    def __init__(self, client: APIClient):
+        self.client = client
+        self.tables: Dict[str, Table] = {}
+        #lists and not sets so the sheet order doesn't depend on the hash seed
+        self.graph: Dict[str, List[str]] = {}
+
+    def resolve(self, root_id: str) -> Dict[str, Table]:
+        frontier = [root_id]
+        seen: Set[str] = {root_id}
+
+        #tables in one frontier don't depend on each other so the whole frontier is one batch
+        while frontier:
+            print(f"Fetching {', '.join(frontier)}...")
+            api_tables = self.client.get_tables_batch(frontier)
+
+            next_frontier = []
+            for table_id in frontier:
+                api_table = api_tables.get(table_id)
+                if not api_table:
+                    print(f"Failed to fetch table {table_id}. Skipping.")
+                    continue
+
+                table = Table(api_table)
+                self.tables[table_id] = table
+                self.graph[table_id] = table.get_linked_table_ids()
+                for link_id in self.graph[table_id]:
+                    if link_id not in seen:
+                        seen.add(link_id)
+                        next_frontier.append(link_id)
+            frontier = next_frontier
+
+        return self.tables
+
+    def layers(self) -> List[List[str]]:
+        #kahn's algorithm, but links between tables can go both ways so cycles must be broken by hand
+        order = {table_id: i for i, table_id in enumerate(self.graph)}
+        in_degree = dict.fromkeys(self.graph, 0)
+        for links in self.graph.values():
+            for link_id in links:
+                if link_id in in_degree:
+                    in_degree[link_id] += 1
+
+        remaining = dict.fromkeys(self.graph)
+        ready = deque(table_id for table_id in remaining if in_degree[table_id] == 0)
+        result = []
+        while remaining:
+            if not ready:
+                #only cycles are left, start from the table that was found first
+                ready.append(next(iter(remaining)))
+
+            layer = sorted(ready, key=order.get)
+            ready.clear()
+            for table_id in layer:
+                del remaining[table_id]
+            for table_id in layer:
+                for link_id in self.graph[table_id]:
+                    if link_id in remaining:
+                        in_degree[link_id] -= 1
+                        if in_degree[link_id] == 0:
+                            ready.append(link_id)
+            result.append(layer)
+        return result
+
+    def ordered_tables(self) -> List[Table]:
+        return [self.tables[table_id] for layer in self.layers() for table_id in layer]
@@ -1,57 +1,80 @@
 import openpyxl
 from openpyxl.utils import get_column_letter #good lord it's not my firts time with openpexl ong
-from typing import List, Dict
+from typing import List, Dict, Any
 from src.core.tables.table import Table
 from src.core.cells.reference_handler import ReferenceHandler
 
+#had to google, apparently Excel sheet names cannot contain : \ / ? * [ ] aaand max 31 chars
+_SHEET_NAME_TRANS = str.maketrans('', '', ':\\/?*[]')
+
 class ExcelWriter:
     def __init__(self, output_file: str):
         self.output_file = output_file
-        self.workbook = openpyxl.Workbook()
-        self.workbook.remove(self.workbook.active)
+        self.workbook = None
         self.table_id_map: Dict[str, str] = {}
 
     def write_tables(self, tables: List[Table]):
-        # first for loop: creating sheets and map IDs to names secodn loop: actually writing stuff
+        if self.workbook is not None:
+            #write only workbooks can be saved exactly once, so a writer is good for one export
+            raise RuntimeError(f"{self.output_file} was already written, use a new ExcelWriter")
+
+        # first for loop: picking sheet names and map IDs to names secodn loop: actually writing stuff
+        existing_names = set()
         for table in tables:
             sheet_name = self._sanitize_sheet_name(table.name)
             original_name = sheet_name
             counter = 1
-            while sheet_name in self.workbook.sheetnames:
+            #excel (and openpyxl) treat "Budget" and "budget" as the same sheet
+            while sheet_name.lower() in existing_names:
                 sheet_name = f"{original_name[:28]}_{counter}"
                 counter += 1
 
-            self.workbook.create_sheet(title=sheet_name)
+            existing_names.add(sheet_name.lower())
             self.table_id_map[table.id] = sheet_name
 
-        for table in tables:
-            sheet_name = self.table_id_map[table.id]
-            ws = self.workbook[sheet_name]
+        table_rows = [self._collect_rows(table) for table in tables]
 
-            for cell in table.cells:
-                value = cell.get_value()
+        #write only mode streams rows straight into the file instead of keeping a Cell object for every value,
+        #but it can't skip rows, every gap is written as an empty <row>. so only use it when tables have few gaps
+        write_only = all(max(rows, default=0) <= 2 * len(rows) for rows in table_rows)
+        self.workbook = openpyxl.Workbook(write_only=write_only)
+        if not write_only:
+            self.workbook.remove(self.workbook.active)
 
-                if isinstance(cell, ReferenceHandler) and isinstance(value, str) and value.startswith("LINK:"):
-                    #soo the format is LINK:table_id!cell_address
-                    try:
-                        _, rest = value.split(":", 1)
-                        ref_table_id, ref_address = rest.split("!", 1)
-                        if ref_table_id in self.table_id_map:
-                            ref_sheet_name = self.table_id_map[ref_table_id]
-                            value = f"='{ref_sheet_name}'!{ref_address}"
-                        else:
-                            value = f"#REF!{ref_table_id}"
-                    except ValueError:
-                         value = "#ERROR!"
-
-                #cell.coordinate is like "A1"
-                ws[cell.coordinate] = value
+        for table, rows in zip(tables, table_rows):
+            ws = self.workbook.create_sheet(title=self.table_id_map[table.id])
+            if write_only:
+                for row in range(1, max(rows, default=0) + 1):
+                    row_values = rows.get(row)
+                    if not row_values:
+                        ws.append([])
+                        continue
+                    ws.append([row_values.get(column) for column in range(1, max(row_values) + 1)])
+            else:
+                for row, row_values in rows.items():
+                    for column, value in row_values.items():
+                        ws.cell(row=row, column=column, value=value)
 
         self.workbook.save(self.output_file)
 
+    def _collect_rows(self, table: Table) -> Dict[int, Dict[int, Any]]:
+        #write only sheets can only append whole rows in order, so group the values by row first
+        rows: Dict[int, Dict[int, Any]] = {}
+        for cell in table.cells:
+            if isinstance(cell, ReferenceHandler) and cell.ref_table_id is not None:
+                ref_sheet_name = self.table_id_map.get(cell.ref_table_id)
+                if ref_sheet_name is not None:
+                    value = f"='{ref_sheet_name}'!{cell.ref_address}"
+                else:
+                    value = f"#REF!{cell.ref_table_id}"
+            else:
+                value = cell.get_value()
+
+            if cell.row < 1 or cell.column < 1:
+                raise ValueError(f"Cell {cell.api_cell.id} in table {table.id} has invalid position "
+                                 f"row={cell.row} column={cell.column}")
+            rows.setdefault(cell.row, {})[cell.column] = value
+        return rows
+
     def _sanitize_sheet_name(self, name: str) -> str:
-        #had to google, apparently Excel sheet names cannot contain : \ / ? * [ ] aaand max 31 chars
-        invalid_chars = [':', '\\', '/', '?', '*', '[', ']']
-        for char in invalid_chars:
-            name = name.replace(char, '')
-        return name[:31]
\ No newline at end of file
+        return name.translate(_SHEET_NAME_TRANS)[:31]
\ No newline at end of file
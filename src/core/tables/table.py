@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Type
 from src.api.models import ApiTable, ApiCell, CellType
 from src.core.cells.base_cell import BaseCell
 from src.core.cells.value_cell import ValueCell
@@ -6,33 +6,43 @@ from src.core.cells.formula_cell import FormulaCell
 from src.core.cells.reference_handler import ReferenceHandler
 
 class Table:
+    #looking up CellType.X goes through the enum metaclass, way slower than one dict lookup per cell
+    _CELL_CLASSES: Dict[CellType, Optional[Type[BaseCell]]] = {
+        CellType.VALUE: ValueCell,
+        CellType.FORMULA: FormulaCell,
+        CellType.LINK: ReferenceHandler,
+        CellType.EMPTY: None
+    }
+
     def __init__(self, api_table: ApiTable):
         self.id = api_table.id
         self.name = api_table.name
         self.cells: List[BaseCell] = []
+        self._cells_by_coordinate: Dict[str, BaseCell] = {}
+        self._linked_table_ids: Dict[str, None] = {}
         self._process_cells(api_table.cells)
 
     def _process_cells(self, api_cells: List[ApiCell]):
+        #hot loop for big tables: no per-cell method call, no isinstance, everything bound to locals
+        cell_classes = self._CELL_CLASSES
+        cells = self.cells
+        cells_by_coordinate = self._cells_by_coordinate
+        linked_table_ids = self._linked_table_ids
         for api_cell in api_cells:
-            cell = self._create_cell(api_cell)
-            if cell:
-                self.cells.append(cell)
+            cell_class = cell_classes.get(api_cell.cell_type, ValueCell)
+            if cell_class is None:
+                continue
+
+            cell = cell_class(api_cell)
+            cells.append(cell)
+            cells_by_coordinate[cell.coordinate] = cell
+            if cell_class is ReferenceHandler:
+                #dict instead of set so the order stays the same as in the table
+                for table_id in cell.get_referenced_table_ids():
+                    linked_table_ids[table_id] = None
 
-    def _create_cell(self, api_cell: ApiCell) -> Optional[BaseCell]:
-        if api_cell.cell_type == CellType.VALUE:
-            return ValueCell(api_cell)
-        elif api_cell.cell_type == CellType.FORMULA:
-            return FormulaCell(api_cell)
-        elif api_cell.cell_type == CellType.LINK:
-            return ReferenceHandler(api_cell)
-        elif api_cell.cell_type == CellType.EMPTY:
-            return None
-        else:
-            return ValueCell(api_cell)
+    def get_cell(self, coordinate: str) -> Optional[BaseCell]:
+        return self._cells_by_coordinate.get(coordinate.upper())
 
     def get_linked_table_ids(self) -> List[str]:
-        ids = set()
-        for cell in self.cells:
-            if isinstance(cell, ReferenceHandler):
-                ids.update(cell.get_referenced_table_ids())
-        return list(ids)
\ No newline at end of file
+        return list(self._linked_table_ids)
\ No newline at end of file
@@ -2,17 +2,20 @@ import unittest
 from unittest.mock import MagicMock, patch
 import os
 import sys
+import tempfile
 from datetime import datetime
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.api.client import APIClient
+from src.api.cache import TableCache
 from src.api.models import ApiTable, ApiCell, CellType, CellReference, FormatType
 from src.core.cells.value_cell import ValueCell
 from src.core.cells.formula_cell import FormulaCell
 from src.core.cells.reference_handler import ReferenceHandler
 from src.core.tables.table import Table
 from src.core.tables.excel_writer import ExcelWriter
+from src.core.tables.dependency_resolver import DependencyResolver
 
 class TestModels(unittest.TestCase):
     def test_api_cell_creation(self):
@@ -71,38 +74,78 @@ class TestTable(unittest.TestCase):
         self.assertIsInstance(table.cells[1], FormulaCell)
         self.assertIsInstance(table.cells[2], ReferenceHandler)
         self.assertEqual(table.get_linked_table_ids(), ["t2"])
+        self.assertIs(table.get_cell("B1"), table.cells[1])
+        self.assertIsNone(table.get_cell("A3")) # Empty cell is not indexed either
 
 class TestAPIClient(unittest.TestCase):
     def setUp(self):
         self.client = APIClient(token="test_token")
 
-    @patch('src.api.client.requests.get')
-    def test_get_tables(self, mock_get):
+    def tearDown(self):
+        self.client.close()
+
+    def test_get_tables(self):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"tables": [{"id": "t1", "name": "Table 1"}]}
-        mock_get.return_value = mock_response
-
-        tables = self.client.get_tables()
+        with patch.object(self.client._session, 'get', return_value=mock_response):
+            tables = self.client.get_tables()
         self.assertEqual(len(tables), 1)
         self.assertEqual(tables[0]['id'], "t1")
 
-    @patch('src.api.client.requests.get')
-    def test_get_table(self, mock_get):
+    def test_get_table(self):
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = b'''{
             "id": "t1",
             "name": "Table 1",
             "cells": [{"id": "c1", "row": 1, "column": 1, "cell_type": "value", "value": 10}]
-        }
-        mock_get.return_value = mock_response
-
-        table = self.client.get_table("t1")
+        }'''
+        with patch.object(self.client._session, 'get', return_value=mock_response):
+            table = self.client.get_table("t1")
         self.assertIsInstance(table, ApiTable)
         self.assertEqual(table.id, "t1")
         self.assertEqual(len(table.cells), 1)
 
+    def test_get_tables_batch(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"tables": {"t1": {"id": "t1", "name": "Table 1"}}}
+        with patch.object(self.client._session, 'post', return_value=mock_response):
+            tables = self.client.get_tables_batch(["t1", "t2"])
+
+        self.assertEqual(tables["t1"].name, "Table 1")
+        self.assertIsNone(tables["t2"])
+
+    def test_get_tables_batch_fallback(self):
+        not_found = MagicMock()
+        not_found.status_code = 404
+        with patch.object(self.client._session, 'post', return_value=not_found) as mock_post, \
+                patch.object(self.client, 'get_table', side_effect=lambda i: ApiTable(id=i, name=i)):
+            tables = self.client.get_tables_batch(["t1", "t2"])
+            self.client.get_tables_batch(["t1", "t2"])
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(tables["t2"].id, "t2")
+
+    def test_get_tables_batch_disabled_after_bad_response(self):
+        forbidden = MagicMock()
+        forbidden.status_code = 403
+        malformed = MagicMock()
+        malformed.status_code = 200
+        malformed.json.return_value = ["not", "a", "dict"]
+
+        for response in (forbidden, malformed):
+            client = APIClient(token="test_token")
+            with patch.object(client._session, 'post', return_value=response) as mock_post, \
+                    patch.object(client, 'get_table', side_effect=lambda i: ApiTable(id=i, name=i)):
+                client.get_tables_batch(["t1", "t2"])
+                tables = client.get_tables_batch(["t1", "t2"])
+            client.close()
+
+            self.assertEqual(mock_post.call_count, 1)
+            self.assertEqual(tables["t1"].id, "t1")
+
     def test_mock_mode(self):
         mock_data = {"t1": ApiTable(id="t1", name="Mock", cells=[])}
         self.client.set_mock_mode(mock_data)
@@ -114,6 +157,110 @@ class TestAPIClient(unittest.TestCase):
         table = self.client.get_table("t1")
         self.assertEqual(table.name, "Mock")
 
+class TestTableCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "tables")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _ok_response(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"id": "t1", "name": "Table 1", "cells": []}'
+        mock_response.headers = {"ETag": '"v1"'}
+        return mock_response
+
+    def test_fresh_entry_skips_request(self):
+        client = APIClient(token="test_token", cache=TableCache(self.cache_path, ttl=3600))
+        with patch.object(client._session, 'get', return_value=self._ok_response()) as mock_get:
+            client.get_table("t1")
+            table = client.get_table("t1")
+        client.close()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(table.name, "Table 1")
+
+    def test_stale_entry_revalidates_with_etag(self):
+        client = APIClient(token="test_token", cache=TableCache(self.cache_path, ttl=0))
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        with patch.object(client._session, 'get', side_effect=[self._ok_response(), not_modified]) as mock_get:
+            client.get_table("t1")
+            table = client.get_table("t1")
+        client.close()
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(table.name, "Table 1")
+
+    def test_broken_entry_is_a_miss(self):
+        cache = TableCache(self.cache_path)
+        cache._db["t1"] = {"etag": '"old"', "last_modified": None, "body": '{"id": "t1"}', "stored_at": 0}
+        client = APIClient(token="test_token", cache=cache)
+        with patch.object(client._session, 'get', return_value=self._ok_response()) as mock_get:
+            tables = client.get_tables_batch(["t1"])
+        client.close()
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {})
+        self.assertEqual(tables["t1"].name, "Table 1")
+
+    def test_corrupt_pickle_is_a_miss(self):
+        cache = TableCache(self.cache_path)
+        cache._db.dict[b"t1"] = b"\x80\x04garbage"
+        client = APIClient(token="test_token", cache=cache)
+        with patch.object(client._session, 'get', return_value=self._ok_response()) as mock_get:
+            tables = client.get_tables_batch(["t1"])
+        client.close()
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {})
+        self.assertEqual(tables["t1"].name, "Table 1")
+
+    def test_entry_missing_key_is_a_miss(self):
+        cache = TableCache(self.cache_path)
+        cache._db["t1"] = {"etag": '"old"', "last_modified": None, "body": '{"id": "t1", "name": "Old"}'}
+        client = APIClient(token="test_token", cache=cache)
+        with patch.object(client._session, 'get', return_value=self._ok_response()) as mock_get:
+            tables = client.get_tables_batch(["t1"])
+        client.close()
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {})
+        self.assertEqual(tables["t1"].name, "Table 1")
+
+class TestDependencyResolver(unittest.TestCase):
+    def _link(self, table_id):
+        return ApiCell(id=f"to_{table_id}", row=1, column=1, cell_type=CellType.LINK,
+                       reference=[CellReference(table_id=table_id, cell_address="A1")])
+
+    def test_resolve_and_layers(self):
+        client = APIClient(token="test_token")
+        client.set_mock_mode({
+            "t1": ApiTable(id="t1", name="Root", cells=[self._link("t2")]),
+            "t2": ApiTable(id="t2", name="Middle", cells=[self._link("t3")]),
+            "t3": ApiTable(id="t3", name="Leaf", cells=[self._link("t2"), self._link("missing")])
+        })
+        resolver = DependencyResolver(client)
+        tables = resolver.resolve("t1")
+        client.close()
+
+        self.assertEqual(set(tables), {"t1", "t2", "t3"})
+        self.assertEqual(resolver.graph["t3"], ["t2", "missing"])
+        # t2 <-> t3 is a cycle, it gets broken at t2 because t2 was found first
+        self.assertEqual(resolver.layers(), [["t1"], ["t2"], ["t3"]])
+        self.assertEqual([t.id for t in resolver.ordered_tables()], ["t1", "t2", "t3"])
+
+    def test_ordered_tables_follow_link_order(self):
+        client = APIClient(token="test_token")
+        mock_data = {"r": ApiTable(id="r", name="Root", cells=[self._link(i) for i in "abcde"])}
+        for i in "abcde":
+            mock_data[i] = ApiTable(id=i, name=i, cells=[self._link("r")])
+        client.set_mock_mode(mock_data)
+        resolver = DependencyResolver(client)
+        resolver.resolve("r")
+        client.close()
+
+        self.assertEqual([t.id for t in resolver.ordered_tables()], ["r", "a", "b", "c", "d", "e"])
+
 class TestExcelWriter(unittest.TestCase):
     def test_write_excel(self):
         api_table1 = ApiTable(
@@ -150,6 +297,78 @@ class TestExcelWriter(unittest.TestCase):
         wb.close()
         os.remove(output_file)
 
+    def test_write_link_to_missing_table(self):
+        api_table = ApiTable(
+            id="t1",
+            name="Lonely",
+            cells=[ApiCell(id="c1", row=1, column=1, cell_type=CellType.LINK, reference=[CellReference(table_id="t9", cell_address="C3")])]
+        )
+        output_file = "test_output_missing.xlsx"
+        ExcelWriter(output_file).write_tables([Table(api_table)])
+
+        import openpyxl
+        wb = openpyxl.load_workbook(output_file)
+        self.assertEqual(wb["Lonely"]["A1"].value, "#REF!t9")
+
+        wb.close()
+        os.remove(output_file)
+
+    def test_write_sparse_table(self):
+        api_table = ApiTable(
+            id="t1",
+            name="Sparse",
+            cells=[ApiCell(id="c1", row=500000, column=1, cell_type=CellType.VALUE, value=1)]
+        )
+        output_file = "test_output_sparse.xlsx"
+        ExcelWriter(output_file).write_tables([Table(api_table)])
+
+        # no empty <row> for every skipped row
+        self.assertLess(os.path.getsize(output_file), 50000)
+        import openpyxl
+        wb = openpyxl.load_workbook(output_file, read_only=True)
+        self.assertEqual(wb["Sparse"].max_row, 500000)
+        self.assertEqual(wb["Sparse"]["A500000"].value, 1)
+
+        wb.close()
+        os.remove(output_file)
+
+    def test_writer_is_one_shot(self):
+        output_file = "test_output_twice.xlsx"
+        writer = ExcelWriter(output_file)
+        writer.write_tables([Table(ApiTable(id="t1", name="Once", cells=[]))])
+        with self.assertRaises(RuntimeError):
+            writer.write_tables([Table(ApiTable(id="t1", name="Once", cells=[]))])
+        os.remove(output_file)
+
+    def test_write_invalid_position(self):
+        api_table = ApiTable(
+            id="t1",
+            name="Broken",
+            cells=[ApiCell(id="c1", row=0, column=1, cell_type=CellType.VALUE, value=1)]
+        )
+        with self.assertRaises(ValueError):
+            ExcelWriter("test_output_invalid.xlsx").write_tables([Table(api_table)])
+        self.assertFalse(os.path.exists("test_output_invalid.xlsx"))
+
+    def test_sheet_names_differing_only_in_case(self):
+        api_table1 = ApiTable(id="t1", name="Budget", cells=[
+            ApiCell(id="c1", row=1, column=1, cell_type=CellType.LINK, reference=[CellReference(table_id="t2", cell_address="B2")])
+        ])
+        api_table2 = ApiTable(id="t2", name="budget", cells=[
+            ApiCell(id="c2", row=1, column=1, cell_type=CellType.LINK, reference=[CellReference(table_id="t1", cell_address="B2")])
+        ])
+        output_file = "test_output_case.xlsx"
+        ExcelWriter(output_file).write_tables([Table(api_table1), Table(api_table2)])
+
+        import openpyxl
+        wb = openpyxl.load_workbook(output_file)
+        self.assertEqual(wb.sheetnames, ["Budget", "budget_1"])
+        self.assertEqual(wb["Budget"]["A1"].value, "='budget_1'!B2")
+        self.assertEqual(wb["budget_1"]["A1"].value, "='Budget'!B2")
+
+        wb.close()
+        os.remove(output_file)
+
     def test_sanitize_sheet_name(self):
         writer = ExcelWriter("dummy")
         name = "Table:With/Invalid*Chars?"